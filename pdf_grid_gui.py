@@ -6,13 +6,15 @@ import datetime
 import subprocess
 import logging
 import signal
+import select
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QGridLayout, QLabel, QPushButton, 
+                             QHBoxLayout, QLabel, QPushButton, 
                              QFrame, QDialog, QProgressBar, QSystemTrayIcon,
-                             QMenu, QAction, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal
-from PyQt5.QtGui import QColor, QPalette, QFont, QIcon
+                             QMenu, QAction, QMessageBox, QToolTip)
+from PyQt5.QtCore import (Qt, QTimer, QSize, QEvent, QPoint, QRect, QObject,
+                          QRunnable, QThreadPool, pyqtSignal)
+from PyQt5.QtGui import QColor, QPalette, QFont, QIcon, QPainter, QBrush, QRegion
 
 from pdf_tracker import PDFTracker
 
@@ -33,76 +35,223 @@ COLORS = [
     "#216e39"   # Darkest green
 ]
 
-class ContributionSquare(QFrame):
-    """A single square in the contribution grid"""
-    clicked = pyqtSignal(str)  # Signal to emit the date when clicked
+# Shared palettes for each entry in COLORS, built on first use since
+# QPalette needs a running QApplication to pick up the default theme
+PALETTES = []
+
+def color_palette(color_index):
+    """Return the shared palette whose background is COLORS[color_index]"""
+    if not PALETTES:
+        for color in COLORS:
+            palette = QApplication.palette()
+            palette.setColor(QPalette.Background, QColor(color))
+            PALETTES.append(palette)
+    return PALETTES[color_index]
+
+# Progress bar styles for each reading level (below minimum, minimum, target, max)
+PROGRESS_STYLES = [
+    "QProgressBar::chunk { background-color: #ebedf0; }",
+    "QProgressBar::chunk { background-color: #9be9a8; }",
+    "QProgressBar::chunk { background-color: #40c463; }",
+    "QProgressBar::chunk { background-color: #216e39; }"
+]
+
+# Brushes for painting each entry in COLORS
+BRUSHES = [QBrush(QColor(color)) for color in COLORS]
+
+class ContributionCells(QWidget):
+    """All the day squares of the contribution grid, painted in one pass"""
+    clicked = pyqtSignal(str)  # Signal to emit the date when a square is clicked
     
-    def __init__(self, date, minutes=0, target_minutes=60):
+    def __init__(self):
         super().__init__()
-        self.date = date
-        self.minutes = minutes
-        self.target_minutes = target_minutes
         self.max_minutes = 180  # Maximum minutes (3 hours) for color scaling
         self.min_threshold = 30  # Minimum minutes before color changes
-        self.setFixedSize(16, 16)  # Use fixed size instead of min/max
-        self.setToolTip(f"{date}: {int(minutes)} minutes")
-        self.update_color()
+        
+        # Color index for every whole minute up to max_minutes. The color
+        # boundaries fall on whole minutes, so the fractional part never matters
+        self._bucket_lut = bytes(self._compute_bucket(m) for m in range(self.max_minutes + 1))
+        
+        # Per-cell state, indexed by week * 7 + day
+        self.dates = []
+        self.minutes = []
+        self._buckets = []  # Color index currently painted for each cell
+        self._rects = []  # Area covered by each cell
+        self._outlines = []  # Rectangle to draw for each cell's frame
+        
+        # Every cell is a fixed 16x16 square with 2px spacing, so the widget
+        # has a fixed size and the layout never needs to measure it
+        self.setFixedSize(53 * 18, 7 * 18)
         
         # Make the squares clickable
-        self.setFrameShape(QFrame.Box)
         self.setCursor(Qt.PointingHandCursor)
     
-    def update_color(self):
-        color_index = 0  # Default white/gray for under 30 minutes
-        
-        if self.minutes >= self.min_threshold:
-            # Calculate how far between min_threshold and max_minutes
-            effective_minutes = min(self.minutes, self.max_minutes)
-            # Scale between min_threshold and max_minutes
-            progress = (effective_minutes - self.min_threshold) / (self.max_minutes - self.min_threshold)
-            # Map to color indices 1-4 (color range is 0-4, but 0 is reserved for < 30 min)
-            color_index = max(1, min(4, 1 + int(progress * 3)))
-            
-        palette = self.palette()
-        palette.setColor(QPalette.Background, QColor(COLORS[color_index]))
-        self.setAutoFillBackground(True)
-        self.setPalette(palette)
-        
-        # Update tooltip with time and thresholds
-        time_desc = f"{int(self.minutes)} minutes"
-        if self.minutes < self.min_threshold:
-            status = f"({int(self.min_threshold - self.minutes)} min to reach next level)"
-        elif self.minutes < self.max_minutes:
-            status = f"({int(self.max_minutes - self.minutes)} min to max level)"
+    def set_dates(self, dates):
+        """Lay out one cell per date, starting from the top-left corner"""
+        self.dates = dates
+        self.minutes = [0] * len(dates)
+        self._buckets = [0] * len(dates)
+        
+        # Cell geometry never changes, so work it out once here rather than
+        # on every paint
+        self._rects = [QRect(week * 18, day * 18, 16, 16)
+                       for week, day in (divmod(index, 7) for index in range(len(dates)))]
+        self._outlines = [rect.adjusted(0, 0, -1, -1) for rect in self._rects]
+        self.update()
+    
+    def _compute_bucket(self, minutes):
+        """Return the color index (0-4) for the given reading time"""
+        if minutes < self.min_threshold:
+            return 0  # Default white/gray for under 30 minutes
+        
+        # Calculate how far between min_threshold and max_minutes
+        effective_minutes = min(minutes, self.max_minutes)
+        # Scale between min_threshold and max_minutes
+        progress = (effective_minutes - self.min_threshold) / (self.max_minutes - self.min_threshold)
+        # Map to color indices 1-4 (color range is 0-4, but 0 is reserved for < 30 min)
+        return max(1, min(4, 1 + int(progress * 3)))
+    
+    def _bucket(self, minutes):
+        """Look up the color index for the given reading time"""
+        return self._bucket_lut[min(max(int(minutes), 0), self.max_minutes)]
+    
+    def set_all_minutes(self, minutes):
+        """Replace every cell's reading time, repainting only cells whose color changed"""
+        if minutes == self.minutes:
+            return
+        buckets = [self._bucket(m) for m in minutes]
+        
+        # Collect all changed cells into one region so the whole refresh
+        # results in a single repaint request
+        dirty = QRegion()
+        for rect, old, new in zip(self._rects, self._buckets, buckets):
+            if old != new:
+                dirty = dirty.united(rect)
+        self.minutes = minutes
+        self._buckets = buckets
+        if not dirty.isEmpty():
+            self.update(dirty)
+    
+    def _cell_at(self, pos):
+        """Return the index of the cell under pos, or None in the gaps"""
+        week, x = divmod(pos.x(), 18)
+        day, y = divmod(pos.y(), 18)
+        if week < 0 or not 0 <= day < 7 or x >= 16 or y >= 16:
+            return None
+        index = week * 7 + day
+        return index if index < len(self.dates) else None
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # Outline each square the same way a plain QFrame.Box would
+        painter.setPen(self.palette().color(QPalette.WindowText))
+        
+        dirty = event.rect()
+        for rect, outline, color_index in zip(self._rects, self._outlines, self._buckets):
+            if rect.intersects(dirty):
+                painter.setBrush(BRUSHES[color_index])
+                painter.drawRect(outline)
+    
+    def _format_tooltip(self, index):
+        """Build the tooltip with time and thresholds"""
+        minutes = self.minutes[index]
+        time_desc = f"{int(minutes)} minutes"
+        if minutes < self.min_threshold:
+            status = f"({int(self.min_threshold - minutes)} min to reach next level)"
+        elif minutes < self.max_minutes:
+            status = f"({int(self.max_minutes - minutes)} min to max level)"
         else:
             status = "(Maximum level reached!)"
         
-        self.setToolTip(f"{self.date}: {time_desc}\n{status}")
+        return f"{self.dates[index]}: {time_desc}\n{status}"
     
-    def update_minutes(self, minutes):
-        self.minutes = minutes
-        self.update_color()
+    def event(self, event):
+        # Build the tooltip only when the user actually hovers a square
+        if event.type() == QEvent.ToolTip:
+            index = self._cell_at(event.pos())
+            if index is None:
+                QToolTip.hideText()
+            else:
+                QToolTip.showText(event.globalPos(), self._format_tooltip(index), self)
+            return True
+        return super().event(event)
     
     def mousePressEvent(self, event):
-        self.clicked.emit(self.date)
+        index = self._cell_at(event.pos())
+        if index is not None:
+            self.clicked.emit(self.dates[index])
         super().mousePressEvent(event)
 
+class DataLoaderSignals(QObject):
+    """Signals for DataLoader, which can't define them itself as a QRunnable"""
+    loaded = pyqtSignal(object)  # Signal to emit the decoded tracking data, or None
+
+class DataLoader(QRunnable):
+    """Reads the tracker's data file on a worker thread"""
+    
+    def __init__(self, tracker):
+        super().__init__()
+        self.tracker = tracker
+        self.signals = DataLoaderSignals()
+    
+    def run(self):
+        try:
+            data = self.tracker.load_data()
+        except (OSError, ValueError) as e:
+            # Daemon may be halfway through writing, the grid keeps showing
+            # what it has and tries again on the next refresh
+            logging.error(f"Error reading tracker data: {e}")
+            data = None
+        self.signals.loaded.emit(data)
+
+class MonthHeader(QWidget):
+    """Row of month names painted above the contribution grid"""
+    
+    def __init__(self):
+        super().__init__()
+        self.anchor = None  # Widget holding the grid, month columns line up with it
+        self._labels = []  # List of (x offset from the grid's left edge, month name)
+        self.setFixedHeight(self.fontMetrics().height() + 4)
+    
+    def set_labels(self, labels):
+        self._labels = labels
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        
+        # Start from wherever the layout placed the grid
+        origin = 0
+        if self.anchor is not None:
+            origin = self.anchor.mapTo(self.window(), QPoint(0, 0)).x() - \
+                     self.mapTo(self.window(), QPoint(0, 0)).x()
+        
+        metrics = self.fontMetrics()
+        baseline = metrics.ascent() + 2
+        for i, (x, month) in enumerate(self._labels):
+            # Leave out a month (e.g. a partial first one) whose name would
+            # run into the next month's name
+            next_x = self._labels[i + 1][0] if i + 1 < len(self._labels) else None
+            if next_x is not None and x + metrics.horizontalAdvance(month) > next_x:
+                continue
+            painter.drawText(origin + x, baseline, month)
+
 class ContributionGrid(QWidget):
     """Widget displaying a GitHub-style contribution grid"""
     
     def __init__(self, tracker):
         super().__init__()
         self.tracker = tracker
-        self.squares = {}  # Dictionary mapping dates to ContributionSquare widgets
+        self._grid_loaded = False  # Whether the squares reflect tracker data yet
+        self._loading = False  # Whether a DataLoader is reading the data file
+        self._progress_level = None  # Index into PROGRESS_STYLES currently applied
         
         # Create the layout
         self.main_layout = QVBoxLayout(self)
         
         # Add month labels
-        month_widget = QWidget()
-        self.month_layout = QHBoxLayout(month_widget)
-        self.month_layout.setContentsMargins(35, 0, 0, 0)  # Add left margin for alignment
-        self.main_layout.addWidget(month_widget)
+        self.month_header = MonthHeader()
+        self.main_layout.addWidget(self.month_header)
         
         # Add day of week labels and grid
         grid_widget = QWidget()
@@ -125,11 +274,10 @@ class ContributionGrid(QWidget):
         self.grid_container.addWidget(dow_widget)
         
         # The actual grid
-        grid_layout_widget = QWidget()
-        self.grid_layout = QGridLayout(grid_layout_widget)
-        self.grid_layout.setSpacing(2)
-        self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        self.grid_container.addWidget(grid_layout_widget)
+        self.cells = ContributionCells()
+        self.cells.clicked.connect(self.show_date_details)
+        self.grid_container.addWidget(self.cells)
+        self.month_header.anchor = self.cells
         self.main_layout.addWidget(grid_widget)
         
         # Status bar
@@ -159,6 +307,9 @@ class ContributionGrid(QWidget):
         self.status_bar.addWidget(self.status_label)
         self.main_layout.addWidget(status_widget)
         
+        # Work out today's date once, it's refreshed by a timer at midnight
+        self._update_today()
+        
         # Create the grid squares for the past year
         self.initialize_grid()
         
@@ -167,79 +318,99 @@ class ContributionGrid(QWidget):
         
         # Set up a timer to update the grid
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.VeryCoarseTimer)  # Let the OS batch wake-ups
         self.timer.timeout.connect(self.update_grid_data)
         self.timer.start(10000)  # Update every 10 seconds
     
+    def _update_today(self):
+        """Cache today's date and schedule the next refresh for midnight"""
+        now = datetime.datetime.now()
+        self._today = now.date()
+        
+        midnight = datetime.datetime.combine(self._today + datetime.timedelta(days=1), datetime.time())
+        QTimer.singleShot(int((midnight - now).total_seconds() * 1000) + 1,
+                          Qt.PreciseTimer, self._start_new_day)
+    
+    def _start_new_day(self):
+        """Shift the grid so the new day gets its own square"""
+        self._update_today()
+        self.initialize_grid()
+        self._grid_loaded = False
+        self.update_grid_data()
+    
     def initialize_grid(self):
         """Initialize the grid with empty squares"""
-        today = datetime.datetime.now().date()
+        today = self._today
         
         # Calculate the first day of the grid (52 weeks ago)
         start_date = today - datetime.timedelta(days=364)
         
-        # Find the first Monday
-        while start_date.weekday() != 0:  # 0 is Monday
-            start_date += datetime.timedelta(days=1)
+        # Back up to the Monday of that week, so today always lands in the
+        # last column
+        start_date -= datetime.timedelta(days=start_date.weekday())  # 0 is Monday
         
-        # Add month labels
-        current_month = None
-        month_labels = {}
+        # Compute every cell's date in one pass: 52 weeks plus current week,
+        # 7 days per week, stopping at today (future dates are skipped)
+        first = start_date.toordinal()
+        day_count = min(53 * 7, today.toordinal() - first + 1)
+        dates = [datetime.date.fromordinal(first + i) for i in range(day_count)]
+        date_strs = [d.isoformat() for d in dates]
         
         # Fill the grid
-        for week in range(53):  # 52 weeks plus current week
-            for day in range(7):  # 7 days per week
-                current_date = start_date + datetime.timedelta(days=(week * 7 + day))
-                
-                # Skip future dates
-                if current_date > today:
-                    continue
-                
-                # Track month changes for labels
-                if current_month != current_date.month:
-                    current_month = current_date.month
-                    month_labels[week] = current_date.strftime("%b")
-                
-                # Create the square
-                date_str = current_date.strftime("%Y-%m-%d")
-                square = ContributionSquare(date_str)
-                square.clicked.connect(self.show_date_details)
-                
-                # Add to grid and track in dictionary
-                # Use a fixed column width to prevent layout issues
-                self.grid_layout.addWidget(square, day, week)
-                self.grid_layout.setColumnMinimumWidth(week, 18)
-                self.grid_layout.setRowMinimumHeight(day, 18)
-                self.squares[date_str] = square
-        
-        # Add month labels - improved positioning
-        prev_week = 0
-        for week, month in month_labels.items():
-            if week > 0:
-                # Add spacing between month labels
-                spacing = (week - prev_week) * 18
-                if spacing > 0:
-                    spacer = QWidget()
-                    spacer.setFixedWidth(spacing)
-                    self.month_layout.addWidget(spacer)
-            
-            label = QLabel(month)
-            label.setAlignment(Qt.AlignCenter)
-            self.month_layout.addWidget(label)
-            prev_week = week
-            
-        # Add stretch to align month labels properly
-        self.month_layout.addStretch()
+        self.cells.set_dates(date_strs)
+        
+        # Add month labels
+        self.month_header.set_labels(self._month_label_offsets(start_date, today))
+    
+    def _month_label_offsets(self, start_date, today):
+        """Return (x offset, month name) for the week column each month starts in"""
+        # Only the first day of each month matters, so step month by month
+        # rather than scanning every cell
+        offsets = []
+        month_start = start_date
+        while month_start <= today:
+            x = (month_start - start_date).days // 7 * 18
+            if offsets and offsets[-1][0] == x:
+                offsets.pop()  # Previous month only covered part of this week
+            offsets.append((x, month_start.strftime("%b")))
+            month_start = (month_start.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        return offsets
     
     def update_grid_data(self):
         """Update grid with actual tracking data"""
+        if self._loading:
+            return  # Wait for the data file read already in progress
+        
+        # The daemon writes the data file whenever anything changes, so if it
+        # hasn't been touched since the last refresh there is nothing to redraw
+        if self.tracker.data_changed():
+            # Decoding the file can take a while once the history grows, so
+            # do it off the GUI thread and refresh when it's done
+            self._loading = True
+            loader = DataLoader(self.tracker)
+            loader.signals.loaded.connect(self._apply_data)
+            QThreadPool.globalInstance().start(loader)
+        elif not self._grid_loaded:
+            self._refresh_display()
+    
+    def _apply_data(self, data):
+        """Take over data read by a DataLoader and redraw"""
+        self._loading = False
+        if data is None:
+            return  # Read failed, keep the data and display we already have
+        self.tracker.data = data
+        self._refresh_display()
+    
+    def _refresh_display(self):
+        """Redraw the grid and status from the tracker's current data"""
+        self._grid_loaded = True
+        
         # Get tracking data
-        history = self.tracker.get_history()
+        days = self.tracker.data["days"]
         status = self.tracker.get_status()
         
-        # Update the grid squares
-        for date, data in history.items():
-            if date in self.squares:
-                self.squares[date].update_minutes(data["minutes"])
+        # Update the grid squares in one go, straight from the per-day totals
+        self.cells.set_all_minutes([days.get(date, 0) for date in self.cells.dates])
         
         # Update status display
         if status["active_session"]:
@@ -249,28 +420,27 @@ class ContributionGrid(QWidget):
             if status["minutes"] >= status["max_minutes"]:
                 # Max level reached - show 100%
                 progress_pct = 100
-                self.progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #216e39; }")
+                progress_level = 3
             elif status["minutes"] >= status["target_minutes"]:
                 # Between target and max
                 progress_pct = 60 + min(40, int(((status["minutes"] - status["target_minutes"]) / 
                                      (status["max_minutes"] - status["target_minutes"])) * 40))
-                self.progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #40c463; }")
+                progress_level = 2
             elif status["minutes"] >= status["min_minutes"]:
                 # Between min and target
                 progress_pct = 30 + min(30, int(((status["minutes"] - status["min_minutes"]) / 
                                      (status["target_minutes"] - status["min_minutes"])) * 30))
-                self.progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #9be9a8; }")
+                progress_level = 1
             else:
                 # Below minimum threshold
                 progress_pct = min(30, int((status["minutes"] / status["min_minutes"]) * 30))
-                self.progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #ebedf0; }")
+                progress_level = 0
             
+            # Restyling is expensive, so only do it when the color changes
+            if progress_level != self._progress_level:
+                self.progress_bar.setStyleSheet(PROGRESS_STYLES[progress_level])
+                self._progress_level = progress_level
             self.progress_bar.setValue(progress_pct)
-            
-            # Update today's square in real-time
-            today = datetime.datetime.now().strftime("%Y-%m-%d")
-            if today in self.squares:
-                self.squares[today].update_minutes(status["minutes"])
         else:
             self.status_label.setText("Not tracking any PDF currently")
     
@@ -306,6 +476,8 @@ class PDFTrackerApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.tracker = PDFTracker()
+        self._daemon_pidfd = None  # pidfd for the running daemon, see _watch_daemon()
+        self._daemon_pid = None  # PID of the running daemon when pidfds aren't available
         self.init_ui()
         
         # Start the tracker in a separate process if not already running
@@ -316,7 +488,8 @@ class PDFTrackerApp(QMainWindow):
     
     def init_ui(self):
         self.setWindowTitle("PDF Reading Tracker")
-        self.setMinimumSize(900, 400)  # Increased size to accommodate grid
+        # Width comes from the layout, which is at least as wide as the grid
+        self.setMinimumHeight(400)
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -365,9 +538,7 @@ class PDFTrackerApp(QMainWindow):
             square = QFrame()
             square.setFixedSize(15, 15)
             square.setAutoFillBackground(True)
-            palette = square.palette()
-            palette.setColor(QPalette.Background, QColor(color))
-            square.setPalette(palette)
+            square.setPalette(color_palette(i))
             square.setFrameShape(QFrame.Box)
             legend_layout.addWidget(square)
             
@@ -384,6 +555,7 @@ class PDFTrackerApp(QMainWindow):
         
         # Set up a timer to update the status
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.VeryCoarseTimer)  # Let the OS batch wake-ups
         self.timer.timeout.connect(self.update_status)
         self.timer.start(5000)  # Update every 5 seconds
     
@@ -510,18 +682,37 @@ class PDFTrackerApp(QMainWindow):
     
     def ensure_tracker_daemon(self):
         """Make sure the tracker daemon is running"""
+        # A pidfd only becomes readable once the process exits, so while we
+        # hold one for the daemon there's no need to look at the PID file
+        if self._daemon_pidfd is not None:
+            readable, _, _ = select.select([self._daemon_pidfd], [], [], 0)
+            if not readable:
+                return
+            os.close(self._daemon_pidfd)
+            self._daemon_pidfd = None
+        
+        # Without pidfd support, probe the PID we found last time directly
+        if self._daemon_pid is not None:
+            try:
+                os.kill(self._daemon_pid, 0)
+                return
+            except OSError:
+                self._daemon_pid = None
+        
         # Check if the daemon is already running using PID file
         pid_file = os.path.expanduser("~/.pdf_tracker.pid")
-        if os.path.exists(pid_file):
+        try:
             with open(pid_file, "r") as f:
-                try:
-                    pid = int(f.read().strip())
-                    os.kill(pid, 0)  # Check if process is running
-                    logging.info(f"Tracker daemon already running (PID: {pid})")
-                    return
-                except (OSError, ValueError):
-                    # Process not running or invalid PID, remove stale PID file
-                    os.remove(pid_file)
+                pid = int(f.read().strip())
+            os.kill(pid, 0)  # Check if process is running
+            logging.info(f"Tracker daemon already running (PID: {pid})")
+            self._watch_daemon(pid)
+            return
+        except FileNotFoundError:
+            pass  # Daemon not started yet
+        except (OSError, ValueError):
+            # Process not running or invalid PID, remove stale PID file
+            os.remove(pid_file)
         
         # Start the tracker daemon
         try:
@@ -539,6 +730,17 @@ class PDFTrackerApp(QMainWindow):
                 f"Could not start the PDF tracker daemon: {e}"
             )
     
+    def _watch_daemon(self, pid):
+        """Keep a handle on the daemon so later checks don't need the PID file"""
+        if hasattr(os, "pidfd_open"):
+            try:
+                self._daemon_pidfd = os.pidfd_open(pid)
+                return
+            except OSError:
+                pass  # Process already gone or pidfds unsupported by the kernel
+        # Not Linux or Python < 3.9, remember the PID instead
+        self._daemon_pid = pid
+    
     def update_status(self):
         """Update the status from the tracker"""
         self.grid_widget.update_grid_data()
@@ -571,16 +773,15 @@ def is_application_running():
     """Check if another instance of the application is running"""
     lock_file = os.path.expanduser("~/.pdf_tracker_gui.lock")
     
-    if os.path.exists(lock_file):
-        # Check if the process is still running
+    # Check if the process holding the lock is still running
+    try:
         with open(lock_file, "r") as f:
-            try:
-                pid = int(f.read().strip())
-                os.kill(pid, 0)  # This will raise OSError if the process is not running
-                return True
-            except (OSError, ValueError):
-                # Process not running or invalid PID
-                pass
+            pid = int(f.read().strip())
+        os.kill(pid, 0)  # This will raise OSError if the process is not running
+        return True
+    except (OSError, ValueError):
+        # No lock file, process not running or invalid PID
+        pass
     
     # Create lock file with current PID
     with open(lock_file, "w") as f:
@@ -7,8 +7,22 @@ import subprocess
 import signal
 import sys
 import logging
+import atexit
+import re
+from functools import cached_property
+from bisect import bisect_right
 from pathlib import Path
 
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Optional, only used on systems without /proc
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional, faster encoding and decoding of the data files
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,175 +31,435 @@ logging.basicConfig(
     filemode='a'
 )
 
+# First command line argument that looks like a PDF, in ps output
+PDF_ARG_RE = re.compile(rb"(\S+\.pdf)\b")
+
+# Seconds between writes of the data file while tracking
+FLUSH_INTERVAL = 60
+
+# Longest time in seconds between checks while no PDF is open, the check
+# interval doubles with each idle check up to this
+MAX_IDLE_INTERVAL = 300
+
+# Seconds between full re-checks of every process in /proc, counted in time
+# rather than scans since the check interval grows while idle
+FULL_SCAN_INTERVAL = 300
+
+# Compact JSON as bytes, the data files are only ever written this way
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
+def write_file_atomic(path, payload):
+    """Replace the file at path with the bytes in payload, never leaving it half written"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
 class PDFTracker:
     def __init__(self, config_file=None):
         self.home_dir = os.path.expanduser("~")
         self.config_file = config_file or os.path.join(self.home_dir, ".pdf_tracker_config.json")
         self.data_file = os.path.join(self.home_dir, ".pdf_tracker_data.json")
+        # Changes since the last snapshot of data_file, one JSON record per line
+        self.days_file = os.path.join(self.home_dir, ".pdf_tracker_days.jsonl")
+        # Time of the last check, rewritten on every flush
+        self.last_check_file = os.path.join(self.home_dir, ".pdf_tracker_last_check")
+        
+        # Configuration and tracking data are loaded on first use, see the
+        # config and data properties
+        self._data_mtime = None  # See data_changed()
         
-        # Load or create configuration
-        self.config = self._load_config()
+        # Process state for _scan_proc()
+        self._have_proc = os.path.isdir("/proc/self")
+        self._watched_pids = set()  # Running target apps
+        self._other_pids = set()  # Processes known not to be target apps
+        self._next_full_scan = 0.0  # time.monotonic() when the next full scan is due
         
-        # Load or create tracking data
-        self.data = self._load_data()
+        # Changes are batched up and written by flush(), see track_session()
+        self._dirty = False
+        self._last_flush = 0.0  # time.monotonic() of the last write
+        self._flush_day = None  # Day of the last write, to compact on rollover
+        self._pending = {}  # date -> minutes added since the last write
+        self._persisted_session = None  # Session as last written, see save_data()
+        atexit.register(self.flush)
+        
+        # time.monotonic() of the previous check, for measuring reading time
+        self._last_check_mono = None
+        
+        # Cached result of _today()
+        self._today_str = None
+        self._today_expires = 0.0
+    
+    @cached_property
+    def config(self):
+        """Configuration, loaded or created on first access"""
+        return self._load_config()
+    
+    @cached_property
+    def data(self):
+        """Tracking data, loaded or created on first access"""
+        return self._load_data()
+    
+    @cached_property
+    def _target_apps(self):
+        return frozenset(self.config["target_apps"])
+    
+    @cached_property
+    def _thresholds(self):
+        # Level is the number of thresholds reached: 0 (none) to 3 (maximum)
+        return (self.config["min_time_minutes"],
+                self.config["target_time_minutes"],
+                self.config["max_time_minutes"])
+    
+    @cached_property
+    def _target_apps_re(self):
+        # All target app names in one pattern, for matching ps output; with
+        # no apps configured it is one that never matches
+        names = [re.escape(os.fsencode(app)) for app in self.config["target_apps"]]
+        return re.compile(b"|".join(names) if names else rb"(?!)")
+    
+    @cached_property
+    def _target_comms(self):
+        # Process names as found in /proc/<pid>/comm, which the kernel
+        # truncates to 15 bytes
+        return frozenset(os.fsencode(app)[:15] for app in self.config["target_apps"])
     
     def _load_config(self):
-        if os.path.exists(self.config_file):
+        try:
             with open(self.config_file, 'r') as f:
                 return json.load(f)
-        else:
-            # Default configuration
-            default_config = {
-                "target_apps": ["evince", "atril", "okular", "xreader", "document-viewer"],
-                "min_time_minutes": 30,  # 30 minutes for first green level
-                "target_time_minutes": 60,  # 1 hour for medium green
-                "max_time_minutes": 180,  # 3 hours for maximum green
-                "check_interval": 10,  # seconds between checks
-            }
-            with open(self.config_file, 'w') as f:
-                json.dump(default_config, f, indent=2)
-            return default_config
+        except FileNotFoundError:
+            pass
+        
+        # Default configuration
+        default_config = {
+            "target_apps": ["evince", "atril", "okular", "xreader", "document-viewer"],
+            "min_time_minutes": 30,  # 30 minutes for first green level
+            "target_time_minutes": 60,  # 1 hour for medium green
+            "max_time_minutes": 180,  # 3 hours for maximum green
+            "check_interval": 10,  # seconds between checks
+        }
+        # Kept indented, the config file is meant to be edited by hand
+        write_file_atomic(self.config_file, json.dumps(default_config, indent=2).encode())
+        return default_config
+    
+    def _data_version(self):
+        """Return the modification times of the snapshot and the day log"""
+        versions = []
+        for path in (self.data_file, self.days_file):
+            try:
+                versions.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                versions.append(None)
+        return tuple(versions)
     
     def _load_data(self):
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
+        # Remember which version of the files we read, see data_changed()
+        self._data_mtime = self._data_version()
+        try:
+            data = _loads(Path(self.data_file).read_bytes())
+        except FileNotFoundError:
+            pass
         else:
-            # Create empty data structure
-            empty_data = {
-                "days": {},  # will contain date -> minutes mapping
-                "last_check": None,
-                "current_session": {
-                    "start": None,
-                    "pdf_path": None,
-                    "accumulated_time": 0
-                }
+            self._replay_days_log(data)
+            self._read_last_check(data)
+            return data
+        
+        # Create empty data structure
+        empty_data = {
+            "days": {},  # will contain date -> minutes mapping
+            "last_check": None,
+            "current_session": {
+                "start": None,
+                "pdf_path": None,
+                "accumulated_time": 0
             }
-            with open(self.data_file, 'w') as f:
-                json.dump(empty_data, f, indent=2)
-            return empty_data
+        }
+        write_file_atomic(self.data_file, _dumps(empty_data))
+        self._data_mtime = self._data_version()
+        return empty_data
+    
+    def _replay_days_log(self, data):
+        """Apply the records appended to the day log since the last snapshot"""
+        try:
+            with open(self.days_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = _loads(line)
+                    except ValueError:
+                        break  # Partially written last line
+                    if "d" in record:
+                        data["days"][record["d"]] = data["days"].get(record["d"], 0) + record["dm"]
+                    else:
+                        data["current_session"] = record["session"]
+        except FileNotFoundError:
+            pass  # Nothing changed since the snapshot
+    
+    def _read_last_check(self, data):
+        try:
+            with open(self.last_check_file, 'r') as f:
+                data["last_check"] = float(f.read())
+        except (FileNotFoundError, ValueError):
+            pass  # Keep the value from the snapshot
+    
+    def _write_last_check(self):
+        if self.data["last_check"] is None:
+            return
+        fd = os.open(self.last_check_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, repr(self.data["last_check"]).encode())
+        finally:
+            os.close(fd)
+    
+    def _session_key(self):
+        """The parts of the current session worth writing to disk when they change"""
+        session = self.data["current_session"]
+        return session["start"], session["pdf_path"]
     
     def save_data(self):
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        """Append what changed since the last write to the day log"""
+        records = [{"d": day, "dm": delta} for day, delta in self._pending.items()]
+        if self._session_key() != self._persisted_session:
+            records.append({"session": self.data["current_session"]})
+            self._persisted_session = self._session_key()
+        if records:
+            with open(self.days_file, 'ab') as f:
+                f.write(b"".join(_dumps(record) + b"\n" for record in records))
+        self._pending.clear()
+        
+        # last_check changes on every tick while nothing else may have, so
+        # it goes to its own tiny file rather than into the log
+        self._write_last_check()
+    
+    def compact(self):
+        """Write a full snapshot of the data and start a new day log"""
+        write_file_atomic(self.data_file, _dumps(self.data))
+        # A crash right here would count the logged minutes twice on the next
+        # load; that window is much smaller than the one for losing them
+        with open(self.days_file, 'w'):
+            pass
+        self._write_last_check()
+        self._pending.clear()
+        self._persisted_session = self._session_key()
+        self._dirty = False
+    
+    def flush(self):
+        """Write any pending changes to the day log"""
+        if self._dirty:
+            self.save_data()
+            self._dirty = False
+        self._last_flush = time.monotonic()
+    
+    def data_changed(self):
+        """Check if the data changed on disk since it was last loaded"""
+        return self._data_version() != self._data_mtime
+    
+    def load_data(self):
+        """Read the data from disk and return it, without replacing self.data
+        
+        Raises OSError or ValueError if the files can't be read, in which case
+        data_changed() keeps reporting a change so the next call tries again.
+        """
+        try:
+            return self._load_data()
+        except (OSError, ValueError):
+            self._data_mtime = None
+            raise
     
     def is_pdf_viewer_running(self):
         """Check if any of the target PDF viewer apps are running"""
-        for app in self.config["target_apps"]:
+        if self._have_proc:
+            return self._scan_proc()
+        if psutil is not None:
+            return self._scan_psutil()
+        return self._scan_ps()
+    
+    def _scan_proc(self):
+        """Look for a target app and its open PDF by reading /proc directly"""
+        pids = {name for name in os.listdir("/proc") if name.isdigit()}
+        
+        # Processes already known not to be a viewer are skipped, so usually
+        # only new PIDs get looked at. Every FULL_SCAN_INTERVAL seconds all of
+        # them are checked again, in case one exec'd into a viewer since
+        now = time.monotonic()
+        if now >= self._next_full_scan:
+            self._next_full_scan = now + FULL_SCAN_INTERVAL
+            self._other_pids = set()
+        
+        watched = set()
+        pdf_path = None
+        for pid in pids - self._other_pids:
             try:
-                output = subprocess.check_output(["pgrep", app])
-                if output:
-                    # Try to get the currently open PDF file
-                    try:
-                        proc_info = subprocess.check_output(["ps", "aux"]).decode('utf-8')
-                        if app in proc_info and ".pdf" in proc_info:
-                            # This is a very simplified approach - might need refinement
-                            for line in proc_info.split('\n'):
-                                if app in line and ".pdf" in line:
-                                    pdf_parts = [part for part in line.split() if ".pdf" in part]
-                                    if pdf_parts:
-                                        return True, pdf_parts[0]
-                        return True, None  # App is running but can't determine PDF
-                    except:
-                        return True, None  # App is running but can't determine PDF
-            except subprocess.CalledProcessError:
+                if pid not in self._watched_pids:
+                    comm = self._read_proc_file(pid, "comm", 64).rstrip(b"\n")
+                    if comm not in self._target_comms:
+                        continue
+                cmdline = self._read_proc_file(pid, "cmdline", 65536)
+            except OSError:
+                continue  # Process exited while we were looking at it
+            
+            watched.add(pid)
+            if pdf_path is None:
+                pdf_path = next((os.fsdecode(arg) for arg in cmdline.split(b"\0") if b".pdf" in arg), None)
+        
+        self._watched_pids = watched
+        self._other_pids = pids - watched
+        # If running without a PDF argument, we couldn't determine the PDF
+        return bool(watched), pdf_path
+    
+    @staticmethod
+    def _read_proc_file(pid, name, size):
+        # Unbuffered os.open/os.read, these files are tiny and read once
+        fd = os.open(f"/proc/{pid}/{name}", os.O_RDONLY)
+        try:
+            return os.read(fd, size)
+        finally:
+            os.close(fd)
+    
+    def _scan_psutil(self):
+        """Look for a target app and its open PDF in one psutil process listing"""
+        app_running = False
+        for proc in psutil.process_iter(["name", "cmdline"]):
+            if proc.info["name"] not in self._target_apps:
                 continue
-        return False, None
+            app_running = True
+            pdf_path = next((arg for arg in proc.info["cmdline"] or [] if ".pdf" in arg), None)
+            if pdf_path:
+                return True, pdf_path
+        return app_running, None  # If running, we couldn't determine the PDF
+    
+    def _scan_ps(self):
+        """Look for a target app and its open PDF in one ps listing, for systems without /proc"""
+        app_running = False
+        try:
+            # Lines are matched as bytes while ps is still writing, the table
+            # as a whole is never decoded or split
+            with subprocess.Popen(["ps", "-axo", "comm=,args="], stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL) as proc:
+                for line in proc.stdout:
+                    comm, _, args = line.lstrip().partition(b" ")
+                    if not self._target_apps_re.search(comm):
+                        continue
+                    app_running = True
+                    match = PDF_ARG_RE.search(args)
+                    if match:
+                        return True, os.fsdecode(match.group(1))
+        except OSError:
+            return False, None  # No usable ps
+        return app_running, None  # If running, we couldn't determine the PDF
+    
+    def _today(self):
+        """Return today's date as YYYY-MM-DD, only recomputed after midnight"""
+        now = time.time()
+        if now >= self._today_expires:
+            today = datetime.date.fromtimestamp(now)
+            self._today_str = today.isoformat()
+            midnight = datetime.datetime.combine(today + datetime.timedelta(days=1), datetime.time())
+            self._today_expires = midnight.timestamp()
+        return self._today_str
     
     def track_session(self):
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
+        today = self._today()
         
         # Initialize today's entry if it doesn't exist
         if today not in self.data["days"]:
             self.data["days"][today] = 0
             
         is_running, pdf_path = self.is_pdf_viewer_running()
+        was_active = self.data["current_session"]["start"] is not None
+        
+        # Elapsed time comes from the monotonic clock so clock changes (NTP,
+        # manual adjustments) can't add or remove reading time
+        now_wall = time.time()
+        now_mono = time.monotonic()
         
         if is_running:
-            current_time = time.time()
-            
             # Start new session or continue current
             if self.data["current_session"]["start"] is None:
-                self.data["current_session"]["start"] = current_time
+                self.data["current_session"]["start"] = now_wall
                 self.data["current_session"]["pdf_path"] = pdf_path
                 self.data["current_session"]["accumulated_time"] = 0
             else:
                 # Calculate time since last check
-                if self.data["last_check"]:
-                    elapsed = current_time - self.data["last_check"]
+                if self._last_check_mono is not None:
+                    elapsed = now_mono - self._last_check_mono
                     self.data["current_session"]["accumulated_time"] += elapsed
                     
                     # Add time to today's total
                     self.data["days"][today] += elapsed / 60  # Convert to minutes
-        else:
+                    self._pending[today] = self._pending.get(today, 0) + elapsed / 60
+        elif was_active:
             # Reset current session if viewer is not running
             self.data["current_session"]["start"] = None
             self.data["current_session"]["pdf_path"] = None
             self.data["current_session"]["accumulated_time"] = 0
         
-        # Update last check time
-        self.data["last_check"] = time.time()
+        # Update last check time, the wall clock one is only kept on disk for
+        # reference
+        self._last_check_mono = now_mono
+        self.data["last_check"] = now_wall
+        # While idle nothing worth saving changed, so there is nothing to flush
+        if is_running or was_active:
+            self._dirty = True
         
-        # Save updated data
-        self.save_data()
+        # Save updated data, but only every FLUSH_INTERVAL seconds unless a
+        # session started or ended. Once a day (and at startup) fold everything
+        # into a fresh snapshot so the day log stays short
+        session_changed = was_active != (self.data["current_session"]["start"] is not None)
+        if today != self._flush_day:
+            self._flush_day = today
+            self.compact()
+            self._last_flush = now_mono
+        elif session_changed or now_mono - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
         
         return self.get_status()
     
     def get_status(self):
         """Return current tracking status"""
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
+        today = self._today()
         minutes_today = self.data["days"].get(today, 0)
-        
-        # Determine level based on minutes read
-        if minutes_today >= self.config["max_time_minutes"]:
-            level = 3  # Maximum level
-        elif minutes_today >= self.config["target_time_minutes"]:
-            level = 2  # Medium level
-        elif minutes_today >= self.config["min_time_minutes"]:
-            level = 1  # Minimum level
-        else:
-            level = 0  # No level reached yet
-            
-        target_reached = minutes_today >= self.config["min_time_minutes"]
+        min_minutes, target_minutes, max_minutes = self._thresholds
         
         return {
             "date": today,
             "minutes": minutes_today,
-            "level": level,
-            "target_reached": target_reached,
-            "min_minutes": self.config["min_time_minutes"],
-            "target_minutes": self.config["target_time_minutes"],
-            "max_minutes": self.config["max_time_minutes"],
+            "level": bisect_right(self._thresholds, minutes_today),
+            "target_reached": minutes_today >= min_minutes,
+            "min_minutes": min_minutes,
+            "target_minutes": target_minutes,
+            "max_minutes": max_minutes,
             "active_session": self.data["current_session"]["start"] is not None,
             "current_pdf": self.data["current_session"]["pdf_path"]
         }
     
     def get_history(self, days=365):
-        """Return reading history for the specified number of days"""
-        history = {}
-        today = datetime.datetime.now().date()
+        """Return reading history for the specified number of days
         
-        for i in range(days):
-            date_key = (today - datetime.timedelta(days=i)).strftime("%Y-%m-%d")
-            minutes = self.data["days"].get(date_key, 0)
-            
-            # Determine level based on minutes read
-            if minutes >= self.config["max_time_minutes"]:
-                level = 3  # Maximum level
-            elif minutes >= self.config["target_time_minutes"]:
-                level = 2  # Medium level
-            elif minutes >= self.config["min_time_minutes"]:
-                level = 1  # Minimum level
-            else:
-                level = 0  # No level reached yet
-                
-            target_reached = minutes >= self.config["min_time_minutes"]
-            
-            history[date_key] = {
-                "minutes": minutes,
-                "level": level,
-                "target_reached": target_reached
-            }
+        Only days with reading time recorded are included; a date in the
+        range that is missing had no reading (0 minutes, level 0).
+        """
+        today = datetime.date.today()
+        first_day = (today - datetime.timedelta(days=days - 1)).isoformat()
+        last_day = today.isoformat()
+        
+        thresholds = self._thresholds
+        min_minutes = thresholds[0]
+        
+        history = {}
+        for date_key, minutes in self.data["days"].items():
+            if first_day <= date_key <= last_day:
+                history[date_key] = {
+                    "minutes": minutes,
+                    "level": bisect_right(thresholds, minutes),
+                    "target_reached": minutes >= min_minutes
+                }
         
         return history
 
@@ -227,9 +501,12 @@ def daemonize():
 
 def handle_signal(signum, frame):
     """Handle termination signals"""
+    # sys.exit() runs the atexit hooks, which flush any unsaved tracking data
     pid_file = os.path.expanduser("~/.pdf_tracker.pid")
-    if os.path.exists(pid_file):
+    try:
         os.remove(pid_file)
+    except FileNotFoundError:
+        pass
     logging.info("PDF Tracker daemon stopped")
     sys.exit(0)
 
@@ -238,16 +515,17 @@ def start_tracker_daemon(daemon_mode=True):
     if daemon_mode:
         # Check if daemon is already running
         pid_file = os.path.expanduser("~/.pdf_tracker.pid")
-        if os.path.exists(pid_file):
+        try:
             with open(pid_file, "r") as f:
                 pid = int(f.read().strip())
-            try:
-                os.kill(pid, 0)  # Check if process is running
-                logging.info(f"PDF Tracker daemon is already running (PID: {pid})")
-                return
-            except OSError:
-                # Process not running, remove stale PID file
-                os.remove(pid_file)
+            os.kill(pid, 0)  # Check if process is running
+            logging.info(f"PDF Tracker daemon is already running (PID: {pid})")
+            return
+        except FileNotFoundError:
+            pass  # No PID file, not running
+        except OSError:
+            # Process not running, remove stale PID file
+            os.remove(pid_file)
         
         # Daemonize
         daemonize()
@@ -259,20 +537,30 @@ def start_tracker_daemon(daemon_mode=True):
     tracker = PDFTracker()
     logging.info("PDF Tracker daemon started")
     
+    check_interval = tracker.config["check_interval"]
+    # Backing off must never check more often than configured
+    max_idle_interval = max(MAX_IDLE_INTERVAL, check_interval)
+    idle_checks = 0
     try:
         while True:
             status = tracker.track_session()
             if status["active_session"]:
+                idle_checks = 0
                 logging.info(f"Tracking: {status['minutes']:.1f} minutes today " +
                      f"({'✓' if status['target_reached'] else '✗'})")
             else:
+                idle_checks += 1
                 logging.debug("No active PDF viewing session detected")
-            time.sleep(tracker.config["check_interval"])
+            # Back off while idle; a new session only counts from the check
+            # that finds it, so this delays tracking but never inflates it
+            time.sleep(min(check_interval * 2 ** min(idle_checks, 5), max_idle_interval))
     except KeyboardInterrupt:
         logging.info("PDF Tracker daemon stopped")
         if daemon_mode:
-            if os.path.exists(pid_file):
+            try:
                 os.remove(pid_file)
+            except FileNotFoundError:
+                pass
 
 if __name__ == "__main__":
     # If running from command line with --no-daemon flag, don't daemonize
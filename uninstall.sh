@@ -37,5 +37,7 @@ echo "Note: Configuration and tracking data are still stored in your home direct
 echo "To remove them completely, delete these files:"
 echo "  ~/.pdf_tracker_config.json"
 echo "  ~/.pdf_tracker_data.json"
+echo "  ~/.pdf_tracker_days.jsonl"
+echo "  ~/.pdf_tracker_last_check"
 echo "  ~/.pdf_tracker.log"
 echo "  ~/.pdf_tracker_gui.log"
\ No newline at end of file